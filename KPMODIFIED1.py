@@ -1,6 +1,13 @@
 import swisseph as se
 import pytz
 import math
+import bisect
+import hashlib
+import json
+import itertools
+from collections import ChainMap
+from functools import lru_cache
+import numpy as np
 import streamlit as st
 from datetime import datetime, date, time
 from reportlab.lib.pagesizes import letter
@@ -20,9 +27,17 @@ import os
 import logging
 from pytz import common_timezones
 import io
+try:
+    from numba import njit
+except Exception:
+    # numba is optional; without it the kernels run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 try:
     from timezonefinder import TimezoneFinder
-    TZF = TimezoneFinder()
+    TZF = TimezoneFinder(in_memory=True)
 except Exception:
     TZF = None
 
@@ -69,6 +84,15 @@ logging.getLogger().addHandler(console_handler)
 logging.info("Application starting up.")
 
 SE_AYANAMSA = se.SIDM_KRISHNAMURTI
+se.set_sid_mode(SE_AYANAMSA)
+se.set_ephe_path(EPHE_PATH)
+
+# swisseph / pytz attributes resolved once instead of per call
+CALC_UT = se.calc_ut
+HOUSES = se.houses
+UTC_TO_JD = se.utc_to_jd
+FLG_SIDEREAL = se.FLG_SIDEREAL  # position only; no FLG_SPEED since velocities are never read
+UTC = pytz.utc
 
 # --- Planet List ---
 PLANET_IDS_ALL = {
@@ -82,6 +106,7 @@ PLANET_IDS_ALL = {
     se.TRUE_NODE: "Rahu",
     # Ketu is calculated manually
 }
+PLANET_ITEMS = tuple(PLANET_IDS_ALL.items())
 
 PLANET_NAMES = {
     se.SUN: "Sun", se.MOON: "Moon", se.MERCURY: "Mercury", se.VENUS: "Venus",
@@ -104,11 +129,33 @@ NAKSHATRA_NAMES = [
     "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta",
     "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati",
 ]
+SIGN_NAMES = (
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces",
+)
+# Reciprocals for sign (30°) and nakshatra (13°20') bucketing: multiply instead of divide
+INV_30 = 1.0 / 30.0
+INV_NAKSHATRA_SPAN = 3.0 / 40.0
+
 SIGN_LORD_MAP = {
     0: "Mars", 1: "Venus", 2: "Mercury", 3: "Moon", 4: "Sun", 5: "Mercury",
     6: "Venus", 7: "Mars", 8: "Jupiter", 9: "Saturn", 10: "Saturn", 11: "Jupiter",
 }
 
+# --- Sub-Lord Tables ---
+# Indexed by star lord (nakshatra index % 9): cumulative sub periods on the 120-unit scale and their lords.
+SUB_CUMS = tuple(
+    tuple(itertools.accumulate(DASHA_PERIODS[NAKSHATRA_LORDS[(start + i) % 9]] for i in range(9)))
+    for start in range(9)
+)
+SUB_LORDS = tuple(tuple(NAKSHATRA_LORDS[(start + i) % 9] for i in range(9)) for start in range(9))
+
+# --- Vimsottari Dasha Tables ---
+DAYS_PER_YEAR = 365.25
+DASHA_ORDER = NAKSHATRA_LORDS[:9]
+DASHA_YEARS = np.array([DASHA_PERIODS[lord] for lord in DASHA_ORDER], dtype=np.float64)
+DASHA_CUMDAYS = np.cumsum(DASHA_YEARS * DAYS_PER_YEAR)
+
 # --- Parashari Natural Friendship Table ---
 GRAHA_MAITRI_PARASHARI = {
     "Sun": {"Sun": 2, "Moon": 2, "Mars": 2, "Mercury": 1, "Jupiter": 2, "Venus": 0, "Saturn": 0},
@@ -119,6 +166,31 @@ GRAHA_MAITRI_PARASHARI = {
     "Venus": {"Sun": 1, "Moon": 1, "Mars": 1, "Mercury": 2, "Jupiter": 0, "Venus": 2, "Saturn": 2},
     "Saturn": {"Sun": 0, "Moon": 0, "Mars": 0, "Mercury": 2, "Jupiter": 1, "Venus": 2, "Saturn": 2},
 }
+# Same table as a 7x7 matrix indexed by LORD_IDX (row = from, column = towards)
+LORD_IDX = {"Sun": 0, "Moon": 1, "Mars": 2, "Mercury": 3, "Jupiter": 4, "Venus": 5, "Saturn": 6}
+MAITRI = np.array(
+    [[GRAHA_MAITRI_PARASHARI[l1].get(l2, 1) for l2 in LORD_IDX] for l1 in LORD_IDX], dtype=np.int8
+)
+# Combined two-way relationship per lord pair, as an index into FRIENDSHIP_NAMES
+FRIENDSHIP_NAMES = ("Great Enemies", "Enemies", "Neutral", "Friends", "Great Friends")
+PAIR_FRIENDSHIP = np.select(
+    [(MAITRI == 2) & (MAITRI.T == 2), (MAITRI == 2) | (MAITRI.T == 2),
+     (MAITRI == 0) & (MAITRI.T == 0), (MAITRI == 0) | (MAITRI.T == 0)],
+    [4, 3, 0, 1], default=2
+).astype(np.int8)
+SIGN_LORD_IDX = np.array([LORD_IDX[SIGN_LORD_MAP[i]] for i in range(12)], dtype=np.int64)
+
+# --- Ashtakoota Lookup Tables ---
+VARNA_BY_RASI = (1, 2, 0, 2, 1, 0, 0, 1, 2, 0, 1, 2)
+VASHYA_BY_RASI = (0, 0, 1, 2, 3, 1, 1, 4, 4, 4, 4, 4)
+YONI_BY_NAK = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13)
+GANA_BY_NAK = (0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2, 0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0)
+FRIENDS_SET = frozenset({
+    ("Sun", "Moon"), ("Sun", "Mars"), ("Sun", "Jupiter"), ("Moon", "Mars"), ("Moon", "Jupiter"),
+    ("Mars", "Jupiter"), ("Mars", "Sun"), ("Mercury", "Venus"), ("Mercury", "Saturn"),
+    ("Jupiter", "Sun"), ("Jupiter", "Moon"), ("Jupiter", "Mars"), ("Jupiter", "Saturn"),
+    ("Venus", "Mercury"), ("Venus", "Saturn"), ("Saturn", "Mercury"), ("Saturn", "Jupiter"), ("Saturn", "Venus"),
+})
 
 # --- Planet Dignity Maps ---
 PLANET_OWN_SIGN = {
@@ -128,27 +200,98 @@ PLANET_OWN_SIGN = {
 PLANET_EXALTATION = {"Sun": 0, "Moon": 1, "Mars": 9, "Mercury": 5, "Jupiter": 3, "Venus": 11, "Saturn": 6}
 PLANET_DEBILITATION = {"Sun": 6, "Moon": 7, "Mars": 3, "Mercury": 11, "Jupiter": 9, "Venus": 5, "Saturn": 0}
 
+# --- House Groups ---
+PROMISE_HOUSES = frozenset({2, 7, 11})
+DENIAL_HOUSES = frozenset({1, 6, 10})
+BENEFIC_HOUSES = frozenset({2, 5, 9, 11})
+MALEFIC_HOUSES = frozenset({1, 6, 8, 12})
+ALL_PLANET_NAMES = ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu")
+
+# --- Sign / House Bitmasks (bit n = sign index n, or house n + 1) ---
+PROMISE_MASK = sum(1 << (h - 1) for h in PROMISE_HOUSES)
+DENIAL_MASK = sum(1 << (h - 1) for h in DENIAL_HOUSES)
+BENEFIC_MASK = sum(1 << (h - 1) for h in BENEFIC_HOUSES)
+MALEFIC_MASK = sum(1 << (h - 1) for h in MALEFIC_HOUSES)
+# Dasha lord status indexed by (promise link << 1) | denial link
+DASHA_STATUS_NAMES = ("NEUTRAL", "DENIAL_PERIOD", "STRONG_PROMISE", "MIXED_RISK")
+H_8_12_MASK = (1 << 7) | (1 << 11)
+H_5_11_MASK = (1 << 4) | (1 << 10)
+H_2_11_MASK = (1 << 1) | (1 << 10)
+H_7_11_MASK = (1 << 6) | (1 << 10)
+H_6_8_12_MASK = (1 << 5) | (1 << 7) | (1 << 11)
+H_8_MASK = 1 << 7
+PLANET_OWN_SIGN_MASK = {p: sum(1 << s for s in signs) for p, signs in PLANET_OWN_SIGN.items()}
+BENEFIC_SIGN_MASK = (1 << 4) | (1 << 8) | (1 << 11)
+KUJA_DOSHA_HOUSE_MASK = (1 << 1) | (1 << 3) | (1 << 6) | (1 << 7) | (1 << 11)  # houses 2, 4, 7, 8, 12
+RAHU_DOSHA_HOUSE_MASK = (1 << 0) | (1 << 4) | (1 << 8)  # houses 1, 5, 9
+
+# --- South Indian Chart Labels (in chart dict order, so each cell lists grahas as before) ---
+SOUTH_CHART_ORDER = tuple(PLANET_IDS_ALL.values()) + ("Ketu", "Lagna")
+SOUTH_CHART_ABBR = np.array(["Su", "Mo", "Me", "Ve", "Ma", "Ju", "Sa", "Ra", "Ke", "Asc"])
+MATCH_ORDER = ("Lagna", "Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu")
+
+# --- Report Styles (shared by every report; Paragraph and Table.setStyle only read them) ---
+REPORT_STYLES = getSampleStyleSheet()
+TABLE_STYLE_DATA = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+])
+CHART_STYLE = TableStyle([
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('FONTSIZE', (0,0), (-1,-1), 8),
+    ('SPAN', (1,1), (2,2)) # Merge center for title
+])
+VERDICT_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.darkblue),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.lightblue),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("FONTNAME", (0, 1), (0, -1), "Helvetica-Bold"),
+])
+# Side-by-side chart container: two 160pt charts plus 6pt cell padding each, gap fills the 456pt frame
+CHART_PAIR_COL_WIDTHS = [172, 112, 172]
+POSITION_HEADER = ["Graha", "Rasi Lord", "Star Lord", "Sub Lord", "Longitude", "Nakshatra", "Pada"]
+
 geolocator = Nominatim(user_agent="kp_match_app")
 
 # --- 2. CORE CALCULATION FUNCTIONS ---
 
-def find_house_index(longitude, cusps):
-    for i in range(0, 12):
-        start = cusps[i]
-        end = cusps[(i + 1) % 12]
-        house_num = i + 1
-        if start < end:
-            if start <= longitude < end:
-                return house_num
-        else:
-            if start <= longitude or longitude < end:
-                return house_num
-    return 0
+def get_monotone_cusps(cusps):
+    """Unwraps the cusps past 360 so they ascend from the Lagna cusp."""
+    cusps_mono = []
+    acc = cusps[0]
+    for c in cusps:
+        if c < acc: c += 360
+        cusps_mono.append(c)
+        acc = c
+    return cusps_mono
+
+def find_house_index(longitude, cusps_mono):
+    lagna = cusps_mono[0]
+    x = longitude if longitude >= lagna else longitude + 360
+    return bisect.bisect_right(cusps_mono, x)
+
+def find_house_indices(longitudes, cusps_mono):
+    """Vectorized find_house_index: house (1-12) for each longitude in an array."""
+    lons = np.asarray(longitudes, dtype=np.float64)
+    x = np.where(lons >= cusps_mono[0], lons, lons + 360)
+    return np.searchsorted(cusps_mono, x, side="right")
 
 def find_house_from_lagna(planet_lon, lagna_lon):
     """Calculates Whole Sign House (1-12) from Lagna."""
-    lagna_sign = int(lagna_lon / 30)
-    planet_sign = int(planet_lon / 30)
+    lagna_sign = int(lagna_lon * INV_30)
+    planet_sign = int(planet_lon * INV_30)
     house = (planet_sign - lagna_sign + 12) % 12 + 1
     return house
 
@@ -156,7 +299,7 @@ def find_house_from_lagna(planet_lon, lagna_lon):
 def get_navamsa_longitude(d1_lon):
     PADA_SIZE = 3 + 20/60
     d1_lon_in_sign = d1_lon % 30
-    d1_sign_index = int(d1_lon / 30)
+    d1_sign_index = int(d1_lon * INV_30)
     pada_index = int(d1_lon_in_sign / PADA_SIZE) 
     
     if d1_sign_index in [0, 3, 6, 9]: start_sign = 0
@@ -172,49 +315,55 @@ def get_d50_longitude(d1_lon):
     d50_lon = (d1_lon * 50.0) % 360.0
     return d50_lon
 
+# --- Batch D9/D50 for a whole chart (scalar versions above remain for single lookups) ---
+def get_navamsa_longitudes(d1_lons):
+    PADA_SIZE = 3 + 20/60
+    lons = np.asarray(d1_lons, dtype=np.float64)
+    sign_idx = (lons * INV_30).astype(np.int64)
+    pada_idx = (np.mod(lons, 30) / PADA_SIZE).astype(np.int64)
+    start_sign = np.where(sign_idx % 3 == 0, 0, np.where(sign_idx % 3 == 1, 9, 6))
+    return ((start_sign + pada_idx) % 12) * 30 + 15
+
+def get_d50_longitudes(d1_lons):
+    return (np.asarray(d1_lons, dtype=np.float64) * 50.0) % 360.0
+
 # --- Parashari Friendship Checker ---
 def check_parashari_friendship(lord1, lord2):
-    if lord1 not in GRAHA_MAITRI_PARASHARI: lord1_map = {} 
-    else: lord1_map = GRAHA_MAITRI_PARASHARI[lord1]
-    
-    if lord2 not in GRAHA_MAITRI_PARASHARI: lord2_map = {}
-    else: lord2_map = GRAHA_MAITRI_PARASHARI[lord2]
-    
-    l1_to_l2 = lord1_map.get(lord2, 1)
-    l2_to_l1 = lord2_map.get(lord1, 1)
-    
-    if l1_to_l2 == 2 and l2_to_l1 == 2: return "Great Friends"
-    if l1_to_l2 == 2 or l2_to_l1 == 2: return "Friends"
-    if l1_to_l2 == 0 and l2_to_l1 == 0: return "Great Enemies"
-    if l1_to_l2 == 0 or l2_to_l1 == 0: return "Enemies"
-    return "Neutral"
+    i, j = LORD_IDX.get(lord1, -1), LORD_IDX.get(lord2, -1)
+    if i < 0 or j < 0: return "Neutral"
+    return FRIENDSHIP_NAMES[PAIR_FRIENDSHIP[i, j]]
 
-def get_julian_day(dob: date, tob: time, timezone_str: str):
+@lru_cache(maxsize=256)
+def get_pytz_timezone(timezone_str):
     try:
-        tz = pytz.timezone(timezone_str)
+        return pytz.timezone(timezone_str)
     except pytz.exceptions.UnknownTimeZoneError:
-        tz = pytz.utc
+        return UTC
+
+@st.cache_data(show_spinner=False)
+def get_julian_day(dob: date, tob: time, timezone_str: str):
+    tz = get_pytz_timezone(timezone_str)
     local_dt = tz.localize(datetime(dob.year, dob.month, dob.day, tob.hour, tob.minute, tob.second))
-    utc_dt = local_dt.astimezone(pytz.utc)
-    return se.utc_to_jd(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour, utc_dt.minute, utc_dt.second)[1]
+    utc_dt = local_dt.astimezone(UTC)
+    return UTC_TO_JD(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour, utc_dt.minute, utc_dt.second)[1]
+
+@lru_cache(maxsize=32)
+def get_julian_day_utc_midnight(year, month, day):
+    return UTC_TO_JD(year, month, day, 0, 0, 0)[1]
 
 def longitude_to_dms(lon):
-    lon = lon % 360
-    degrees = int(lon)
-    minutes_float = (lon - degrees) * 60
-    minutes = int(minutes_float)
-    seconds = round((minutes_float - minutes) * 60, 2)
-    return f"{degrees}° {minutes}' {seconds}\""
+    total_cs = int(round((lon % 360) * 360000))  # centiseconds of arc
+    degrees, rem = divmod(total_cs, 360000)
+    minutes, cs = divmod(rem, 6000)
+    return f"{degrees % 360}° {minutes}' {cs / 100.0}\""
 
 def get_sign_name(lon):
-    sign_index = int(lon / 30)
-    signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
-    return signs[sign_index % 12]
+    return SIGN_NAMES[int(lon * INV_30) % 12]
 
 def get_nakshatra_and_pada(longitude: float):
     longitude = longitude % 360
     nakshatra_span = 13 + 20 / 60
-    nak_index = int(longitude / nakshatra_span) % 27
+    nak_index = int(longitude * INV_NAKSHATRA_SPAN) % 27
     nak_name = NAKSHATRA_NAMES[nak_index]
     nak_start = nak_index * nakshatra_span
     offset = longitude - nak_start
@@ -222,88 +371,75 @@ def get_nakshatra_and_pada(longitude: float):
     pada = int(offset / pada_span) + 1
     return nak_name, pada
 
+def get_position_indices(longitudes, cusps_mono):
+    """Sign index, nakshatra index, pada and house for a batch of longitudes."""
+    nakshatra_span = 13 + 20 / 60
+    lons = np.asarray(longitudes, dtype=np.float64)
+    sign_idx = (lons * INV_30).astype(np.int64) % 12
+    lons_360 = lons % 360
+    nak_idx = (lons_360 * INV_NAKSHATRA_SPAN).astype(np.int64) % 27
+    pada = ((lons_360 - nak_idx * nakshatra_span) / (nakshatra_span / 4.0)).astype(np.int64) + 1
+    houses = find_house_indices(lons, cusps_mono)
+    return sign_idx.tolist(), nak_idx.tolist(), pada.tolist(), houses.tolist()
+
+@lru_cache(maxsize=4096)
 def get_star_sub_lord(longitude):
     nakshatra_span = 13 + 20 / 60
     longitude = longitude % 360
-    nakshatra_index = int(longitude / nakshatra_span) % 27
+    nakshatra_index = int(longitude * INV_NAKSHATRA_SPAN) % 27
     star_lord = NAKSHATRA_LORDS[nakshatra_index]
-    nakshatra_start_deg = nakshatra_index * nakshatra_span
-    relative_deg = longitude - nakshatra_start_deg
-    nakshatra_fraction_completed = relative_deg / nakshatra_span
-    star_lord_index = NAKSHATRA_LORDS[:9].index(star_lord)
-    cumulative_time_in_nakshatra = nakshatra_fraction_completed * 120
-    current_cumulative_time = 0
-    sub_lord = "N/A"
-    for i in range(9):
-        lord_index = (star_lord_index + i) % 9
-        lord = NAKSHATRA_LORDS[lord_index]
-        period = DASHA_PERIODS[lord]
-        current_cumulative_time += period
-        if cumulative_time_in_nakshatra < current_cumulative_time:
-            sub_lord = lord
-            break
-    return star_lord, sub_lord
-
-def get_significators(planet_lon, all_cusps, chart_planets):
-    s1_s2_significators = set()
-    s3_s4_significators = set()
-    star_lord_name, sub_lord_name = get_star_sub_lord(planet_lon)
-    planet_sign_index = int(planet_lon / 30)
-    planet_owner = SIGN_LORD_MAP.get(planet_sign_index)
+    relative_deg = longitude - nakshatra_index * nakshatra_span
+    cumulative_time_in_nakshatra = relative_deg / nakshatra_span * 120
+    star_lord_index = nakshatra_index % 9
+    sub_index = bisect.bisect_right(SUB_CUMS[star_lord_index], cumulative_time_in_nakshatra)
+    if sub_index >= 9: return star_lord, "N/A"
+    return star_lord, SUB_LORDS[star_lord_index][sub_index]
+
+def get_cusp_lord_houses(cusps):
+    """Maps each sign lord to the cusp (house) numbers whose sign it owns."""
+    lord_to_houses = {}
+    for i, cusp_lon in enumerate(cusps):
+        lord_to_houses.setdefault(SIGN_LORD_MAP[int(cusp_lon * INV_30) % 12], []).append(i + 1)
+    return lord_to_houses
+
+def mask_to_list(mask):
+    """House numbers (ascending) whose bits are set in a house bitmask."""
+    return [h for h in range(1, 13) if (mask >> (h - 1)) & 1]
+
+def get_significators(star_lord_name, planet_owner, planet_house, planet_sign_lords, planet_houses, lord_to_houses):
+    """KP significators from a planet's precomputed star lord, sign lord and house.
+    Returns (star-level mask, planet-level mask) as house bitmasks."""
+    s1_s2_mask = 0
+    s3_s4_mask = 0
     star_lord_lookup = star_lord_name
     if star_lord_name in ["Rahu", "Ketu"]:
-        node_sign_lon = chart_planets.get(star_lord_name)
-        if node_sign_lon is not None:
-            star_lord_sign_index = int(node_sign_lon / 30)
-            star_lord_lookup = SIGN_LORD_MAP.get(star_lord_sign_index)
-        else:
-            star_lord_lookup = None
+        # Node star lords resolve to the node's sign lord, already known for this chart
+        star_lord_lookup = planet_sign_lords.get(star_lord_name)
     if star_lord_lookup is not None:
-        star_lord_lon = chart_planets.get(star_lord_lookup)
-        if isinstance(star_lord_lon, (float, int)):
-            star_lord_house = find_house_index(star_lord_lon, all_cusps)
+        star_lord_house = planet_houses.get(star_lord_lookup)
+        if star_lord_house is not None:
             if star_lord_house > 0:
-                s1_s2_significators.add(star_lord_house)
-            for i in range(0, 12):
-                cusp_lon = all_cusps[i]
-                sign_index = int(cusp_lon / 30)
-                sign_lord = SIGN_LORD_MAP.get(sign_index)
-                if sign_lord == star_lord_lookup:
-                    s1_s2_significators.add(i + 1)
-    planet_house = find_house_index(planet_lon, all_cusps)
+                s1_s2_mask |= 1 << (star_lord_house - 1)
+            for h in lord_to_houses.get(star_lord_lookup, []):
+                s1_s2_mask |= 1 << (h - 1)
     if planet_house > 0:
-        s3_s4_significators.add(planet_house)
-    for i in range(0, 12):
-        cusp_lon = all_cusps[i]
-        sign_index = int(cusp_lon / 30)
-        sign_lord = SIGN_LORD_MAP.get(sign_index)
-        if sign_lord == planet_owner:
-            s3_s4_significators.add(i + 1)
-    return sorted(list(s1_s2_significators)) + sorted(list(s3_s4_significators))
+        s3_s4_mask |= 1 << (planet_house - 1)
+    for h in lord_to_houses.get(planet_owner, []):
+        s3_s4_mask |= 1 << (h - 1)
+    return s1_s2_mask, s3_s4_mask
 
 def calculate_ashtakoota(chart1_data, chart2_data):
-    nakshatra_span = 13 + 20 / 60
     moon_lon_c1 = chart1_data["moon_lon"]
     moon_lon_c2 = chart2_data["moon_lon"]
-    nak_index_c1 = int(moon_lon_c1 % 360 / nakshatra_span) % 27
-    nak_index_c2 = int(moon_lon_c2 % 360 / nakshatra_span) % 27
-    moon_rasi_index_c1 = int(moon_lon_c1 / 30) % 12
-    moon_rasi_index_c2 = int(moon_lon_c2 / 30) % 12
+    nak_index_c1 = int(moon_lon_c1 % 360 * INV_NAKSHATRA_SPAN) % 27
+    nak_index_c2 = int(moon_lon_c2 % 360 * INV_NAKSHATRA_SPAN) % 27
+    moon_rasi_index_c1 = int(moon_lon_c1 * INV_30) % 12
+    moon_rasi_index_c2 = int(moon_lon_c2 * INV_30) % 12
     total_score = 0
     
-    def get_varna(rasi_index):
-        if rasi_index in [2, 5, 6, 9]: return 0
-        if rasi_index in [0, 4, 7, 10]: return 1
-        return 2
-    if get_varna(moon_rasi_index_c1) <= get_varna(moon_rasi_index_c2): total_score += 1
+    if VARNA_BY_RASI[moon_rasi_index_c1] <= VARNA_BY_RASI[moon_rasi_index_c2]: total_score += 1
     
-    def get_vashya(rasi_index):
-        if rasi_index in [0, 1]: return 0
-        if rasi_index in [2, 5, 6]: return 1
-        if rasi_index in [3]: return 2
-        if rasi_index in [4]: return 3
-        return 4
-    v1, v2 = get_vashya(moon_rasi_index_c1), get_vashya(moon_rasi_index_c2)
+    v1, v2 = VASHYA_BY_RASI[moon_rasi_index_c1], VASHYA_BY_RASI[moon_rasi_index_c2]
     if v1 == v2: total_score += 2
     elif (v1==0 and v2==3) or (v1==3 and v2==0): total_score += 0
     else: total_score += 1
@@ -315,33 +451,18 @@ def calculate_ashtakoota(chart1_data, chart2_data):
     if (dist2 + 1) % 9 not in [3, 5, 7]: t_score += 1.5
     total_score += t_score
     
-    def get_yoni(nak_index):
-        yoni_map = {0: 1, 1: 2, 2: 3, 3: 4, 4: 5, 5: 6, 6: 7, 7: 8, 8: 9, 9: 10, 10: 11, 11: 12, 12: 13, 13: 14, 14: 1, 15: 2, 16: 3, 17: 4, 18: 5, 19: 6, 20: 7, 21: 8, 22: 9, 23: 10, 24: 11, 25: 12, 26: 13}
-        return yoni_map.get(nak_index, 0)
-    y1, y2 = get_yoni(nak_index_c1), get_yoni(nak_index_c2)
+    y1, y2 = YONI_BY_NAK[nak_index_c1], YONI_BY_NAK[nak_index_c2]
     if y1 == y2: total_score += 4
     elif (y1 + y2) % 2 == 0: total_score += 3
     
-    rasi_lord_map = {0: "Mars", 1: "Venus", 2: "Mercury", 3: "Moon", 4: "Sun", 5: "Mercury", 6: "Venus", 7: "Mars", 8: "Jupiter", 9: "Saturn", 10: "Saturn", 11: "Jupiter"}
-    l1, l2 = rasi_lord_map.get(moon_rasi_index_c1), rasi_lord_map.get(moon_rasi_index_c2)
-    
-    def get_graha_maitri(lord1, lord2):
-        if lord1 == lord2: return 5
-        friendly_pairs = [("Sun", "Moon"), ("Sun", "Mars"), ("Sun", "Jupiter"), ("Moon", "Mars"), ("Moon", "Jupiter"),
-                         ("Mars", "Jupiter"), ("Mars", "Sun"), ("Mercury", "Venus"), ("Mercury", "Saturn"),
-                         ("Jupiter", "Sun"), ("Jupiter", "Moon"), ("Jupiter", "Mars"), ("Jupiter", "Saturn"),
-                         ("Venus", "Mercury"), ("Venus", "Saturn"), ("Saturn", "Mercury"), ("Saturn", "Jupiter"), ("Saturn", "Venus")]
-        if (lord1, lord2) in friendly_pairs and (lord2, lord1) in friendly_pairs: return 5
-        if (lord1, lord2) in friendly_pairs or (lord2, lord1) in friendly_pairs: return 4
-        if lord1 in ["Sun", "Moon"] and lord2 in ["Saturn", "Venus"]: return 0
-        return 1
-    total_score += get_graha_maitri(l1, l2)
+    l1, l2 = SIGN_LORD_MAP[moon_rasi_index_c1], SIGN_LORD_MAP[moon_rasi_index_c2]
+    if l1 == l2: total_score += 5
+    elif (l1, l2) in FRIENDS_SET and (l2, l1) in FRIENDS_SET: total_score += 5
+    elif (l1, l2) in FRIENDS_SET or (l2, l1) in FRIENDS_SET: total_score += 4
+    elif l1 in ["Sun", "Moon"] and l2 in ["Saturn", "Venus"]: total_score += 0
+    else: total_score += 1
     
-    def get_gana(nak_index):
-        if nak_index in [0, 4, 6, 7, 12, 14, 16, 21, 26]: return 0 
-        if nak_index in [1, 3, 5, 10, 11, 19, 20, 24, 25]: return 1 
-        return 2 
-    g1, g2 = get_gana(nak_index_c1), get_gana(nak_index_c2)
+    g1, g2 = GANA_BY_NAK[nak_index_c1], GANA_BY_NAK[nak_index_c2]
     if g1 == g2: total_score += 6
     elif (g1==0 and g2==1) or (g1==1 and g2==0): total_score += 5
     elif (g1==1 and g2==2) or (g1==2 and g2==1): total_score += 1
@@ -353,11 +474,15 @@ def calculate_ashtakoota(chart1_data, chart2_data):
     
     return min(max(round(total_score), 0), 36)
 
-def calculate_supplementary_factors(chart1_data, chart2_data):
-    def check_affliction(sigs, houses):
-        return any(h in sigs for h in houses)
+def check_affliction(sig_mask, houses_mask):
+    return bool(sig_mask & houses_mask)
 
+def calculate_supplementary_factors(chart1_data, chart2_data):
     results = {}
+    c1_csl = chart1_data["csl_significators_mask"]
+    c2_csl = chart2_data["csl_significators_mask"]
+    c1_masks = chart1_data["planet_significator_masks"]
+    c2_masks = chart2_data["planet_significator_masks"]
     
     c1_dosha = chart1_data["mars_dosha_status"]["Total"] == "Afflicted"
     c2_dosha = chart2_data["mars_dosha_status"]["Total"] == "Afflicted"
@@ -371,30 +496,30 @@ def calculate_supplementary_factors(chart1_data, chart2_data):
     else:
         results['Kuja_Dosha_Parity'] = "Clean" 
 
-    c1_ayur_risk = check_affliction(chart1_data["csl_significators"], [8, 12])
-    c2_ayur_risk = check_affliction(chart2_data["csl_significators"], [8, 12])
+    c1_ayur_risk = check_affliction(c1_csl, H_8_12_MASK)
+    c2_ayur_risk = check_affliction(c2_csl, H_8_12_MASK)
     results['Ayurvriddhi_Match'] = "Poor (Shared Risk)" if c1_ayur_risk and c2_ayur_risk else "Good"
     results['Vaidhavya_Risk'] = "High" if c1_ayur_risk and c2_ayur_risk else "Low"
     results['Pitra_Dosha_Match'] = "Present in Both" if chart1_data["pitra_dosha_present"] and chart2_data["pitra_dosha_present"] else "Mixed"
-    c1_prog_promise = check_affliction(chart1_data["csl_significators"], [5, 11])
-    c2_prog_promise = check_affliction(chart2_data["csl_significators"], [5, 11])
+    c1_prog_promise = check_affliction(c1_csl, H_5_11_MASK)
+    c2_prog_promise = check_affliction(c2_csl, H_5_11_MASK)
     results['Progeny_Match'] = "Strong" if c1_prog_promise and c2_prog_promise else "Weak/Mixed"
-    c1_dhana = check_affliction(chart1_data["csl_significators"], [2, 11])
-    c2_dhana = check_affliction(chart2_data["csl_significators"], [2, 11])
+    c1_dhana = check_affliction(c1_csl, H_2_11_MASK)
+    c2_dhana = check_affliction(c2_csl, H_2_11_MASK)
     results['Financial_Match'] = "Strong" if c1_dhana and c2_dhana else "Average"
-    c1_karaka = check_affliction(chart1_data["jupiter_significators"], [7, 11])
-    c2_karaka = check_affliction(chart2_data["venus_significators"], [7, 11])
+    c1_karaka = check_affliction(c1_masks.get("Jupiter", 0), H_7_11_MASK)
+    c2_karaka = check_affliction(c2_masks.get("Venus", 0), H_7_11_MASK)
     results['Karaka_Compatibility'] = "High" if c1_karaka and c2_karaka else "Moderate"
-    c1_7th_lord_ok = not check_affliction(chart1_data["csl_significators"], [6, 8, 12])
-    c2_7th_lord_ok = not check_affliction(chart2_data["csl_significators"], [6, 8, 12])
+    c1_7th_lord_ok = not check_affliction(c1_csl, H_6_8_12_MASK)
+    c2_7th_lord_ok = not check_affliction(c2_csl, H_6_8_12_MASK)
     results['7th_Lord_Strength'] = "Good" if c1_7th_lord_ok and c2_7th_lord_ok else "Weak/Afflicted"
-    c1_sat_8th = 8 in chart1_data["saturn_significators"]
-    c2_sat_8th = 8 in chart2_data["saturn_significators"]
+    c1_sat_8th = check_affliction(c1_masks.get("Saturn", 0), H_8_MASK)
+    c2_sat_8th = check_affliction(c2_masks.get("Saturn", 0), H_8_MASK)
     results['Ashtama_Shani_Effect'] = "High Risk (Natal)" if c1_sat_8th or c2_sat_8th else "Low Risk"
     results['Dasha_Synchronization'] = "Favorable" if chart1_data["marriage_promise"] != "DENIAL" and chart2_data["marriage_promise"] != "DENIAL" else "Unfavorable"
     results['Rasi_Navamsa_Match'] = f"Moon Rasi Lords: {chart1_data['rasi_lord']} vs {chart2_data['rasi_lord']}"
-    c1_lagna_lord = SIGN_LORD_MAP.get(int(chart1_data["cusps"][0] / 30) % 12)
-    c2_lagna_lord = SIGN_LORD_MAP.get(int(chart2_data["cusps"][0] / 30) % 12)
+    c1_lagna_lord = SIGN_LORD_MAP.get(int(chart1_data["cusps"][0] * INV_30) % 12)
+    c2_lagna_lord = SIGN_LORD_MAP.get(int(chart2_data["cusps"][0] * INV_30) % 12)
     results['Lagna_Lord_Friendship'] = f"Lords are {c1_lagna_lord} & {c2_lagna_lord}"
     
     results['D9_Lagna_Lord_Friendship'] = check_parashari_friendship(
@@ -403,19 +528,24 @@ def calculate_supplementary_factors(chart1_data, chart2_data):
 
     return results
 
-def get_graha_position_details(planet_name, longitude):
-    star_lord, sub_lord = get_star_sub_lord(longitude)
-    rasi_index = int(longitude / 30) % 12
+def get_graha_position_details(planet_name, longitude, precomputed=None):
+    """precomputed: optional (rasi_index, nak_index, pada, (star_lord, sub_lord)) from the batch lookup."""
+    if precomputed is None:
+        rasi_index = int(longitude * INV_30) % 12
+        nak_name, pada = get_nakshatra_and_pada(longitude)
+        star_lord, sub_lord = get_star_sub_lord(longitude)
+    else:
+        rasi_index, nak_index, pada, (star_lord, sub_lord) = precomputed
+        nak_name = NAKSHATRA_NAMES[nak_index]
     rasi_lord = SIGN_LORD_MAP.get(rasi_index)
-    nak_name, pada = get_nakshatra_and_pada(longitude)
     return [planet_name, rasi_lord, star_lord, sub_lord, longitude_to_dms(longitude), nak_name, f"Pada {pada}"]
 
 def check_kuja_cancellation(mars_lon, planets, d9_planets, moon_lon, sun_lon):
-    mars_sign_index = int(mars_lon / 30) % 12
-    if mars_sign_index in PLANET_OWN_SIGN["Mars"]: return True, "Cancelled (Own Sign D1)"
+    mars_sign_index = int(mars_lon * INV_30) % 12
+    if (PLANET_OWN_SIGN_MASK["Mars"] >> mars_sign_index) & 1: return True, "Cancelled (Own Sign D1)"
     if mars_sign_index == PLANET_EXALTATION["Mars"]: return True, "Cancelled (Exalted D1)"
     if mars_sign_index == PLANET_DEBILITATION["Mars"]: return True, "Cancelled (Debilitated D1)"
-    if mars_sign_index in [4, 8, 11]: return True, "Cancelled (Benefic Sign D1)"
+    if (BENEFIC_SIGN_MASK >> mars_sign_index) & 1: return True, "Cancelled (Benefic Sign D1)"
 
     benefics = {"Jupiter": planets.get("Jupiter"), "Venus": planets.get("Venus")}
     moon_sun_dist = abs(moon_lon - sun_lon)
@@ -423,34 +553,34 @@ def check_kuja_cancellation(mars_lon, planets, d9_planets, moon_lon, sun_lon):
 
     for name, ben_lon in benefics.items():
         if ben_lon is None: continue
-        ben_sign_index = int(ben_lon / 30) % 12
+        ben_sign_index = int(ben_lon * INV_30) % 12
         if abs(mars_lon - ben_lon) < 8 or abs(mars_lon - ben_lon) > 352: return True, f"Cancelled (Conj. {name} D1)"
         aspect_7th_sign = (ben_sign_index + 6) % 12
         if mars_sign_index == aspect_7th_sign: return True, f"Cancelled (Aspect {name} D1)"
             
     jup_lon = planets.get("Jupiter")
     if jup_lon is not None:
-        jup_sign_index = int(jup_lon / 30) % 12
-        if mars_sign_index in [(jup_sign_index + 4) % 12, (jup_sign_index + 8) % 12]:
+        jup_sign_index = int(jup_lon * INV_30) % 12
+        aspect_mask = (1 << ((jup_sign_index + 4) % 12)) | (1 << ((jup_sign_index + 8) % 12))
+        if (aspect_mask >> mars_sign_index) & 1:
             return True, "Cancelled (Aspect Jupiter D1)"
 
     mars_d9_lon = d9_planets.get("Mars")
     if mars_d9_lon is not None:
-        mars_d9_sign = int(mars_d9_lon / 30)
-        if mars_d9_sign in PLANET_OWN_SIGN["Mars"]: return True, "Cancelled (Own Sign D9)"
+        mars_d9_sign = int(mars_d9_lon * INV_30)
+        if (PLANET_OWN_SIGN_MASK["Mars"] >> mars_d9_sign) & 1: return True, "Cancelled (Own Sign D9)"
         if mars_d9_sign == PLANET_EXALTATION["Mars"]: return True, "Cancelled (Exalted D9)"
         if mars_d9_sign == PLANET_DEBILITATION["Mars"]: return True, "Cancelled (Debilitated D9)"
 
     return False, "Afflicted"
 
 def check_doshas_from_points(mars_house, rahu_house, moon_house, venus_house, mars_lon, planets, d9_planets, moon_lon, sun_lon):
-    kuja_dosha_houses = [2, 4, 7, 8, 12]
     mars_from_moon = ((mars_house - moon_house + 12) % 12) + 1
     mars_from_venus = ((mars_house - venus_house + 12) % 12) + 1
 
-    lagna_afflicted = mars_house in kuja_dosha_houses
-    chandra_afflicted = mars_from_moon in kuja_dosha_houses
-    shukra_afflicted = mars_from_venus in kuja_dosha_houses
+    lagna_afflicted = bool((KUJA_DOSHA_HOUSE_MASK >> (mars_house - 1)) & 1)
+    chandra_afflicted = bool((KUJA_DOSHA_HOUSE_MASK >> (mars_from_moon - 1)) & 1)
+    shukra_afflicted = bool((KUJA_DOSHA_HOUSE_MASK >> (mars_from_venus - 1)) & 1)
     
     mars_dosha_status = {
         "Lagna": "Afflicted" if lagna_afflicted else "Clean",
@@ -464,11 +594,10 @@ def check_doshas_from_points(mars_house, rahu_house, moon_house, venus_house, ma
         if is_cancelled: mars_dosha_status["Total"] = reason 
         else: mars_dosha_status["Total"] = "Afflicted"
     
-    rahu_dosha_houses = [1, 5, 9]
     rahu_from_moon = ((rahu_house - moon_house + 12) % 12) + 1
     rahu_dosha_status = {
-        "Lagna": "Afflicted" if rahu_house in rahu_dosha_houses else "Clean",
-        "Chandra": "Afflicted" if rahu_from_moon in rahu_dosha_houses else "Clean",
+        "Lagna": "Afflicted" if (RAHU_DOSHA_HOUSE_MASK >> (rahu_house - 1)) & 1 else "Clean",
+        "Chandra": "Afflicted" if (RAHU_DOSHA_HOUSE_MASK >> (rahu_from_moon - 1)) & 1 else "Clean",
         "Total": "Not Afflicted",
     }
     if "Afflicted" in rahu_dosha_status.values():
@@ -476,237 +605,308 @@ def check_doshas_from_points(mars_house, rahu_house, moon_house, venus_house, ma
 
     return mars_dosha_status, rahu_dosha_status
 
+@njit
+def find_dasha_period(start_index, scale_years, period_years, elapsed_days):
+    """Returns the DASHA_ORDER index of the period running elapsed_days into a sequence
+    starting at start_index, and the day offset at which that period began.
+    Period i lasts (scale_years * period_years[i] / 120) years."""
+    cum = 0.0
+    prev = 0.0
+    for k in range(9):
+        prev = cum
+        cum += (scale_years * period_years[(start_index + k) % 9] / 120.0) * 365.25
+        if elapsed_days < cum:
+            return (start_index + k) % 9, prev
+    return (start_index + 8) % 9, prev
+
+@njit
+def dasha_kernel(elapsed_days, lord_index_at_birth, period_years):
+    """MD/AD/PD indices into DASHA_ORDER, elapsed_days after the birth MD began."""
+    md_index, md_offset = find_dasha_period(lord_index_at_birth, 120.0, period_years, elapsed_days)
+    ad_index, ad_offset = find_dasha_period(md_index, period_years[md_index], period_years, elapsed_days - md_offset)
+    pd_index, _ = find_dasha_period(ad_index, period_years[ad_index], period_years, elapsed_days - md_offset - ad_offset)
+    return md_index, ad_index, pd_index
+
 def calculate_vimsottari_dasha(birth_jd, moon_lon, target_jd):
     NAKSHATRA_SPAN = 13 + 20 / 60
-    DASHAS_LORDS = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
-    TOTAL_DASHAS_YEARS = 120.0
-    DAYS_PER_YEAR = 365.25
     moon_lon = moon_lon % 360
-    nak_index = int(moon_lon / NAKSHATRA_SPAN)
+    nak_index = int(moon_lon * INV_NAKSHATRA_SPAN)
     nak_lord_at_birth = NAKSHATRA_LORDS[nak_index % 27]
     nak_start_deg = nak_index * NAKSHATRA_SPAN
     offset_deg = moon_lon - nak_start_deg
     fraction_covered = offset_deg / NAKSHATRA_SPAN
-    lord_index_at_birth = DASHAS_LORDS.index(nak_lord_at_birth)
+    lord_index_at_birth = DASHA_ORDER.index(nak_lord_at_birth)
     total_dasha_years = DASHA_PERIODS[nak_lord_at_birth]
-    remaining_years = (1 - fraction_covered) * total_dasha_years
-    remaining_days = remaining_years * DAYS_PER_YEAR
     md_start_jd = birth_jd - (fraction_covered * total_dasha_years * DAYS_PER_YEAR)
-    md_end_jd = birth_jd + remaining_days
-    current_md_lord = nak_lord_at_birth
-    current_md_start_jd = md_start_jd
-    current_md_end_jd = md_end_jd
-    current_lord_index = lord_index_at_birth
-    while target_jd >= current_md_end_jd:
-        current_lord_index = (current_lord_index + 1) % 9
-        current_md_lord = DASHAS_LORDS[current_lord_index]
-        current_md_start_jd = current_md_end_jd
-        md_years = DASHA_PERIODS[current_md_lord]
-        current_md_end_jd += (md_years * DAYS_PER_YEAR)
-    
-    ad_lord_index = current_lord_index
-    current_ad_lord = DASHAS_LORDS[ad_lord_index]
-    current_ad_start_jd = current_md_start_jd
-    ad_years_prop = DASHA_PERIODS[current_ad_lord]
-    ad_days = (DASHA_PERIODS[current_md_lord] * ad_years_prop / TOTAL_DASHAS_YEARS) * DAYS_PER_YEAR
-    current_ad_end_jd = current_ad_start_jd + ad_days
-    while target_jd >= current_ad_end_jd:
-        ad_lord_index = (ad_lord_index + 1) % 9
-        current_ad_lord = DASHAS_LORDS[ad_lord_index]
-        current_ad_start_jd = current_ad_end_jd
-        ad_years_prop = DASHA_PERIODS[current_ad_lord]
-        ad_days = (DASHA_PERIODS[current_md_lord] * ad_years_prop / TOTAL_DASHAS_YEARS) * DAYS_PER_YEAR
-        current_ad_end_jd += ad_days
-
-    pd_lord_index = ad_lord_index
-    current_pd_lord = DASHAS_LORDS[pd_lord_index]
-    current_pd_start_jd = current_ad_start_jd
-    pd_years_prop = DASHA_PERIODS[current_pd_lord]
-    pd_days = (DASHA_PERIODS[current_ad_lord] * pd_years_prop / TOTAL_DASHAS_YEARS) * DAYS_PER_YEAR
-    current_pd_end_jd = current_pd_start_jd + pd_days
-    while target_jd >= current_pd_end_jd:
-        pd_lord_index = (pd_lord_index + 1) % 9
-        current_pd_lord = DASHAS_LORDS[pd_lord_index]
-        current_pd_start_jd = current_pd_end_jd
-        pd_years_prop = DASHA_PERIODS[current_pd_lord]
-        pd_days = (DASHA_PERIODS[current_ad_lord] * pd_years_prop / TOTAL_DASHAS_YEARS) * DAYS_PER_YEAR
-        current_pd_end_jd += pd_days
-    return current_md_lord, current_ad_lord, current_pd_lord
+
+    # Skip whole 120-year cycles, then walk the cumulative MD/AD/PD periods
+    elapsed = target_jd - md_start_jd
+    cycle_days = float(DASHA_CUMDAYS[-1])
+    if elapsed >= cycle_days:
+        elapsed -= (elapsed // cycle_days) * cycle_days
+    md_index, ad_index, pd_index = dasha_kernel(elapsed, lord_index_at_birth, DASHA_YEARS)
+    return DASHA_ORDER[md_index], DASHA_ORDER[ad_index], DASHA_ORDER[pd_index]
 
 
 def analyze_chart(dob: date, tob: time, latitude: float, longitude: float, timezone_str: str, name: str):
-    try:
-        jd = get_julian_day(dob, tob, timezone_str)
-        se.set_sid_mode(SE_AYANAMSA)
+    """Cache-friendly front end: ISO date/time strings and coordinates at the 4 decimals the UI shows.
+    The name is presentational, so it is attached after the cached lookup."""
+    chart = analyze_chart_core(
+        dob.isoformat(), tob.isoformat(), round(latitude, 4), round(longitude, 4), timezone_str,
+        datetime.utcnow().date().isoformat()
+    )
+    # st.cache_data hands back a fresh copy on every call, so filling in the name is safe
+    chart["name"] = name
+    chart["analysis_data"]["name"] = name
+    return chart
+
+# Cached across Streamlit reruns; today's UTC date is part of the key because it picks the current dasha
+@st.cache_data(show_spinner=False, max_entries=256)
+def analyze_chart_core(dob_iso: str, tob_iso: str, latitude: float, longitude: float, timezone_str: str, utc_date_iso: str):
+    dob = date.fromisoformat(dob_iso)
+    tob = time.fromisoformat(tob_iso)
+    utc_today = date.fromisoformat(utc_date_iso)
+    jd = get_julian_day(dob, tob, timezone_str)
+
+    result = HOUSES(jd, latitude, longitude, b"P")
+    cusps = list(result[0])[0:12]
+    cusps_mono = get_monotone_cusps(cusps)
+    
+    planets = {p_name: CALC_UT(jd, p_id, flags=FLG_SIDEREAL)[0][0] for p_id, p_name in PLANET_ITEMS}
 
-        result = se.houses(jd, latitude, longitude, b"P")
-        cusps = list(result[0])[0:12]
-        
-        planets = {}
-        for p_id, p_name in PLANET_IDS_ALL.items():
-            xx, ret = se.calc_ut(jd, p_id, flags=se.FLG_SIDEREAL)
-            planets[p_name] = xx[0]
-            
-        if "Rahu" in planets:
-            planets["Ketu"] = (planets["Rahu"] + 180.0) % 360.0
-        
-        # Explicitly add Lagna to D1 planets for uniformity
-        planets["Lagna"] = cusps[0]
-
-        # D9 Calculation (Full)
-        d9_planets = {}
-        for p_name, p_lon in planets.items():
-            if p_name == "Lagna":
-                d9_planets["Lagna"] = get_navamsa_longitude(cusps[0])
-            else:
-                d9_planets[p_name] = get_navamsa_longitude(p_lon)
-        
-        d9_lagna_lon = d9_planets["Lagna"]
-        d9_lagna_lord = SIGN_LORD_MAP[int(d9_lagna_lon / 30)]
-        
-        # D50 Calculation (Full)
-        d50_planets = {}
-        for p_name, p_lon in planets.items():
-             if p_name == "Lagna":
-                 d50_planets["Lagna"] = get_d50_longitude(cusps[0])
-             else:
-                 d50_planets[p_name] = get_d50_longitude(p_lon)
-        
-        d50_lagna_lon = d50_planets["Lagna"]
-        d50_lagna_lord = SIGN_LORD_MAP[int(d50_lagna_lon / 30)]
-        
-        # D1 Data
-        moon_lon = planets["Moon"]
-        venus_lon = planets["Venus"]
-        mars_lon = planets["Mars"]
-        sun_lon = planets["Sun"]
-        moon_rasi_index = int(moon_lon / 30) % 12
-        moon_rasi_lord = SIGN_LORD_MAP.get(moon_rasi_index)
-
-        mars_house = find_house_index(mars_lon, cusps)
-        moon_house = find_house_index(moon_lon, cusps)
-        venus_house = find_house_index(venus_lon, cusps)
-        rahu_house = find_house_index(planets["Rahu"], cusps)
-        sun_house = find_house_index(sun_lon, cusps)
-        
-        mars_dosha_status, rahu_dosha_status = check_doshas_from_points(
-            mars_house, rahu_house, moon_house, venus_house, 
-            mars_lon, planets, d9_planets, moon_lon, sun_lon
+    if "Rahu" in planets:
+        planets["Ketu"] = (planets["Rahu"] + 180.0) % 360.0
+    
+    # Explicitly add Lagna to D1 planets for uniformity
+    planets["Lagna"] = cusps[0]
+
+    # D9 / D50 Calculation (Full, Lagna included)
+    planet_keys = list(planets)
+    d1_lons = np.fromiter(planets.values(), dtype=np.float64, count=len(planet_keys))
+    d9_planets = dict(zip(planet_keys, get_navamsa_longitudes(d1_lons).tolist()))
+    d50_planets = dict(zip(planet_keys, get_d50_longitudes(d1_lons).tolist()))
+
+    d9_lagna_lon = d9_planets["Lagna"]
+    d9_lagna_lord = SIGN_LORD_MAP[int(d9_lagna_lon * INV_30)]
+    
+    d50_lagna_lon = d50_planets["Lagna"]
+    d50_lagna_lord = SIGN_LORD_MAP[int(d50_lagna_lon * INV_30)]
+    
+    # D1 Data
+    moon_lon = planets["Moon"]
+    mars_lon = planets["Mars"]
+    sun_lon = planets["Sun"]
+    moon_rasi_index = int(moon_lon * INV_30) % 12
+    moon_rasi_lord = SIGN_LORD_MAP.get(moon_rasi_index)
+
+    # Batch sign/nakshatra/pada/house lookup for Lagna + all grahas
+    position_names = ["Lagna"] + [p for p in ALL_PLANET_NAMES if p in planets]
+    sign_idx, nak_idx, pada, houses = get_position_indices([planets[p] for p in position_names], cusps_mono)
+    planet_houses = dict(zip(position_names, houses))
+    lord_to_houses = get_cusp_lord_houses(cusps)
+
+    # Star lord and sign lord resolved once per graha, then shared by every significator lookup
+    planet_star_subs = {p: get_star_sub_lord(planets[p]) for p in position_names}
+    planet_sign_lords = {p: SIGN_LORD_MAP[sign_idx[i]] for i, p in enumerate(position_names)}
+    planet_significators = {}
+    planet_significator_masks = {}
+    planet_significator_levels = {}
+    for p_name in position_names[1:]:
+        s1_s2_mask, s3_s4_mask = get_significators(
+            planet_star_subs[p_name][0], planet_sign_lords[p_name], planet_houses[p_name],
+            planet_sign_lords, planet_houses, lord_to_houses
         )
+        planet_significator_levels[p_name] = (s1_s2_mask, s3_s4_mask)
+        planet_significator_masks[p_name] = s1_s2_mask | s3_s4_mask
+        planet_significators[p_name] = mask_to_list(s1_s2_mask) + mask_to_list(s3_s4_mask)
+
+    mars_house = planet_houses["Mars"]
+    moon_house = planet_houses["Moon"]
+    venus_house = planet_houses["Venus"]
+    rahu_house = planet_houses["Rahu"]
+    sun_house = planet_houses["Sun"]
+    
+    mars_dosha_status, rahu_dosha_status = check_doshas_from_points(
+        mars_house, rahu_house, moon_house, venus_house, 
+        mars_lon, planets, d9_planets, moon_lon, sun_lon
+    )
 
-        pitra_dosha_present = False
-        if (9 in get_significators(planets["Rahu"], cusps, planets) or 
-            9 in get_significators(planets["Ketu"], cusps, planets) or 
-            rahu_house == 9 or sun_house == 9):
-            pitra_dosha_present = True
-
-        kp_positions = []
-        kp_positions.append(get_graha_position_details("Lagna Cusp", cusps[0]))
-        for p_name in ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]:
-            if p_name in planets:
-                kp_positions.append(get_graha_position_details(p_name, planets[p_name]))
-
-        seventh_cusp_lon = cusps[6]
-        seventh_star, seventh_sub = get_star_sub_lord(seventh_cusp_lon)
-        csl_planet_name = seventh_sub 
-        csl_planet_lon = planets.get(csl_planet_name)
-        if csl_planet_lon is None: csl_significators = [] 
-        else: csl_significators = get_significators(csl_planet_lon, cusps, planets)
-        
-        marriage_promise = any(h in csl_significators for h in [2, 7, 11])
-        marriage_denial = any(h in csl_significators for h in [1, 6, 10])
-        if marriage_promise and not marriage_denial: promise_verdict = "STRONG"
-        elif marriage_promise and marriage_denial: promise_verdict = "MIXED"
-        elif not marriage_promise and marriage_denial: promise_verdict = "DENIAL"
-        else: promise_verdict = "NEUTRAL" 
-
-        planet_significators = {}
-        all_planet_names = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
-        for p_name in all_planet_names:
-            if p_name in planets:
-                planet_significators[p_name] = get_significators(planets[p_name], cusps, planets)
-        
-        jupiter_significators = planet_significators.get("Jupiter", [])
-        saturn_significators = planet_significators.get("Saturn", [])
-        venus_significators = planet_significators.get("Venus", [])
-        planet_favorability = {}
-        for p_name in ["Jupiter", "Saturn", "Venus", "Sun", "Mars"]:
-            sigs = planet_significators.get(p_name, []) 
-            favorable_links = sum(1 for h in sigs if h in [2, 5, 9, 11])
-            unfavorable_links = sum(1 for h in sigs if h in [1, 6, 8, 12])
-            if favorable_links > unfavorable_links: strength = "Favorable"
-            elif unfavorable_links > favorable_links: strength = "Unfavorable"
-            else: strength = "Neutral"
-            planet_favorability[p_name] = f"{strength} ({favorable_links}F/{unfavorable_links}UF)"
-
-        utc_now = datetime.utcnow()
-        jd_today = se.utc_to_jd(utc_now.year, utc_now.month, utc_now.day, 0, 0, 0)[1]
-        md_lord, ad_lord, pd_lord = calculate_vimsottari_dasha(jd, moon_lon, jd_today)
-
-        d1_7th_lord_name = SIGN_LORD_MAP[int(cusps[6] / 30)]
-        d1_7th_lord_d9_lon = d9_planets.get(d1_7th_lord_name)
-        d1_7th_lord_d9_house = find_house_from_lagna(d1_7th_lord_d9_lon, d9_lagna_lon)
-        d1_7th_lord_d9_sign = get_sign_name(d1_7th_lord_d9_lon)
-
-        analysis_data = {
-            "name": name,
-            "moon_lon": moon_lon,
-            "planet_significators": planet_significators, 
-            "jupiter_significators": jupiter_significators, 
-            "saturn_significators": saturn_significators, 
-            "venus_significators": venus_significators,
-            "csl_significators": csl_significators,
-            "mars_dosha_status": mars_dosha_status,
-            "pitra_dosha_present": pitra_dosha_present,
-            "marriage_promise": promise_verdict,
-            "cusps": cusps,
-            "planets": planets,
-            "planet_favorability": planet_favorability,
-            "rasi_lord": moon_rasi_lord,
-            "md_lord": md_lord,
-            "ad_lord": ad_lord,
-            "pd_lord": pd_lord,
-            # Parashari/D9 data
-            "d9_lagna_sign": get_sign_name(d9_lagna_lon),
-            "d9_lagna_lord": d9_lagna_lord,
-            "d1_7th_lord_name": d1_7th_lord_name,
-            "d1_7th_lord_d9_house_text": f"In {d1_7th_lord_d9_house}H ({d1_7th_lord_d9_sign})",
-            # Full D9 Data
-            "d9_planets": d9_planets,
-            # Full D50 Data
-            "d50_planets": d50_planets,
-            "d50_lagna_lord": d50_lagna_lord,
-        }
-
-        return {
-            "name": name, "dob": str(dob), "tob": str(tob), "lat": latitude, "lon": longitude,
-            "7th_csl": seventh_sub, "marriage_promise": promise_verdict,
-            "csl_significators": csl_significators,
-            "jupiter_significators": jupiter_significators,
-            "saturn_significators": saturn_significators,
-            "venus_significators": venus_significators,
-            "moon_lon": moon_lon, "rasi_lord": moon_rasi_lord,
-            "kp_positions": kp_positions,
-            "mars_dosha_status": mars_dosha_status,
-            "rahu_dosha_status": rahu_dosha_status,
-            "pitra_dosha_present": pitra_dosha_present,
-            "planet_favorability": planet_favorability,
-            "planet_significators": planet_significators,
-            "md_lord": md_lord, "ad_lord": ad_lord, "pd_lord": pd_lord,
-            "analysis_data": analysis_data 
-        }
+    pitra_dosha_present = False
+    if ((planet_significator_masks["Rahu"] >> 8) & 1 or 
+        (planet_significator_masks["Ketu"] >> 8) & 1 or 
+        rahu_house == 9 or sun_house == 9):
+        pitra_dosha_present = True
+
+    kp_positions = []
+    for i, p_name in enumerate(position_names):
+        label = "Lagna Cusp" if p_name == "Lagna" else p_name
+        kp_positions.append(get_graha_position_details(
+            label, planets[p_name], (sign_idx[i], nak_idx[i], pada[i], planet_star_subs[p_name])
+        ))
+
+    seventh_cusp_lon = cusps[6]
+    seventh_star, seventh_sub = get_star_sub_lord(seventh_cusp_lon)
+    csl_planet_name = seventh_sub 
+    csl_planet_lon = planets.get(csl_planet_name)
+    if csl_planet_lon is None: csl_significators, csl_significators_mask = [], 0
+    else: csl_significators, csl_significators_mask = planet_significators[csl_planet_name], planet_significator_masks[csl_planet_name]
+    
+    marriage_promise = bool(csl_significators_mask & PROMISE_MASK)
+    marriage_denial = bool(csl_significators_mask & DENIAL_MASK)
+    if marriage_promise and not marriage_denial: promise_verdict = "STRONG"
+    elif marriage_promise and marriage_denial: promise_verdict = "MIXED"
+    elif not marriage_promise and marriage_denial: promise_verdict = "DENIAL"
+    else: promise_verdict = "NEUTRAL" 
+
+    jupiter_significators = planet_significators.get("Jupiter", [])
+    saturn_significators = planet_significators.get("Saturn", [])
+    venus_significators = planet_significators.get("Venus", [])
+    planet_favorability = {}
+    for p_name in ["Jupiter", "Saturn", "Venus", "Sun", "Mars"]:
+        # Count per level so a house signified at both levels counts twice, as in the list form
+        levels = planet_significator_levels.get(p_name, (0, 0))
+        favorable_links = sum((m & BENEFIC_MASK).bit_count() for m in levels)
+        unfavorable_links = sum((m & MALEFIC_MASK).bit_count() for m in levels)
+        if favorable_links > unfavorable_links: strength = "Favorable"
+        elif unfavorable_links > favorable_links: strength = "Unfavorable"
+        else: strength = "Neutral"
+        planet_favorability[p_name] = f"{strength} ({favorable_links}F/{unfavorable_links}UF)"
+
+    jd_today = get_julian_day_utc_midnight(utc_today.year, utc_today.month, utc_today.day)
+    md_lord, ad_lord, pd_lord = calculate_vimsottari_dasha(jd, moon_lon, jd_today)
+
+    asc_sign_idx = int(cusps[0] * INV_30) % 12
+    d1_7th_lord_name = SIGN_LORD_MAP[int(cusps[6] * INV_30)]
+    d1_7th_lord_d9_lon = d9_planets.get(d1_7th_lord_name)
+    d1_7th_lord_d9_house = find_house_from_lagna(d1_7th_lord_d9_lon, d9_lagna_lon)
+    d1_7th_lord_d9_sign = get_sign_name(d1_7th_lord_d9_lon)
+
+    analysis_data = {
+        "name": None,
+        "moon_lon": moon_lon,
+        "planet_significators": planet_significators, 
+        "jupiter_significators": jupiter_significators, 
+        "saturn_significators": saturn_significators, 
+        "venus_significators": venus_significators,
+        "csl_significators": csl_significators,
+        "csl_significators_mask": csl_significators_mask,
+        "planet_significator_masks": planet_significator_masks,
+        "mars_dosha_status": mars_dosha_status,
+        "pitra_dosha_present": pitra_dosha_present,
+        "marriage_promise": promise_verdict,
+        "cusps": cusps,
+        "cusps_mono": cusps_mono,
+        "planets": planets,
+        "planet_favorability": planet_favorability,
+        "rasi_lord": moon_rasi_lord,
+        "md_lord": md_lord,
+        "ad_lord": ad_lord,
+        "pd_lord": pd_lord,
+        # Parashari/D9 data
+        "d9_lagna_sign": get_sign_name(d9_lagna_lon),
+        "d9_lagna_lord": d9_lagna_lord,
+        "d1_7th_lord_name": d1_7th_lord_name,
+        "d1_7th_lord_d9_house_text": f"In {d1_7th_lord_d9_house}H ({d1_7th_lord_d9_sign})",
+        # Full D9 Data
+        "d9_planets": d9_planets,
+        # Full D50 Data
+        "d50_planets": d50_planets,
+        "d50_lagna_lord": d50_lagna_lord,
+    }
 
-    except Exception as e:
-        logging.error(f"Exception in analyze_chart for {name}: {e}", exc_info=True)
-        raise
+    return {
+        "name": None, "dob": str(dob), "tob": str(tob), "lat": latitude, "lon": longitude,
+        "asc_sign_idx": asc_sign_idx, "asc_lord": SIGN_LORD_MAP[asc_sign_idx],
+        "7th_csl": seventh_sub, "marriage_promise": promise_verdict,
+        "csl_significators": csl_significators,
+        "csl_significators_mask": csl_significators_mask,
+        "jupiter_significators": jupiter_significators,
+        "saturn_significators": saturn_significators,
+        "venus_significators": venus_significators,
+        "moon_lon": moon_lon, "rasi_lord": moon_rasi_lord,
+        "kp_positions": kp_positions,
+        "mars_dosha_status": mars_dosha_status,
+        "rahu_dosha_status": rahu_dosha_status,
+        "pitra_dosha_present": pitra_dosha_present,
+        "planet_favorability": planet_favorability,
+        "planet_significators": planet_significators,
+        "planet_significator_masks": planet_significator_masks,
+        "md_lord": md_lord, "ad_lord": ad_lord, "pd_lord": pd_lord,
+        "analysis_data": analysis_data 
+    }
+
+def check_dasha_marriage_potential(sig_mask):
+    marriage_links = bool(sig_mask & PROMISE_MASK)
+    denial_links = bool(sig_mask & DENIAL_MASK)
+    return DASHA_STATUS_NAMES[(marriage_links << 1) | denial_links]
+
+def get_chart_flags(chart):
+    """CSL / Saturn house links used across the report, probed once per chart."""
+    csl_mask = chart["csl_significators_mask"]
+    return {
+        "affliction": bool(csl_mask & H_8_12_MASK),
+        "progeny": bool(csl_mask & (H_2_11_MASK | H_5_11_MASK)),
+        "financial": bool(csl_mask & H_2_11_MASK),
+        "ashtama_shani": bool(chart["planet_significator_masks"].get("Saturn", 0) & H_8_MASK),
+    }
+
+def get_flag_labels(flags):
+    """Per-native status labels for the supplementary factors table."""
+    return {
+        "ayurvriddhi": "Risk" if flags["affliction"] else "Good",
+        "progeny": "Promising" if flags["progeny"] else "Weak",
+        "financial": "Strong" if flags["financial"] else "Average",
+        "ashtama_shani": "8th Link" if flags["ashtama_shani"] else "Clean",
+    }
+
+def get_south_chart_cells(planet_data):
+    """Graha abbreviations stacked per sign (index 0 = Aries) for a South Indian chart."""
+    lons = np.fromiter((planet_data.get(p, np.nan) for p in SOUTH_CHART_ORDER), dtype=np.float64, count=len(SOUTH_CHART_ORDER))
+    present = ~np.isnan(lons)
+    sign_idx = np.where(present, (np.where(present, lons, 0.0) * INV_30).astype(np.int64) % 12, -1)
+    return ["\n".join(SOUTH_CHART_ABBR[sign_idx == i]) for i in range(12)]
+
+def precompute_chart_display(chart):
+    """South Indian chart cells for D1/D9/D50, built once per native and shared by every section."""
+    analysis = chart["analysis_data"]
+    return {
+        "d1": get_south_chart_cells(analysis["planets"]),
+        "d9": get_south_chart_cells(analysis.get("d9_planets") or {}),
+        "d50": get_south_chart_cells(analysis.get("d50_planets") or {}),
+    }
 
-def check_dasha_marriage_potential(significators):
-    marriage_links = any(h in significators for h in [2, 7, 11])
-    denial_links = any(h in significators for h in [1, 6, 10])
-    if marriage_links and not denial_links: return "STRONG_PROMISE"
-    elif marriage_links and denial_links: return "MIXED_RISK"
-    elif denial_links: return "DENIAL_PERIOD"
-    else: return "NEUTRAL"
+def get_match_rows(dicts1, dicts2):
+    """Sign/Bhava/friendship rows for each pair of divisional chart dicts (D1, D9, ...),
+    computed for all charts at once. Returns (rows, friendly_count, total_checked) per chart."""
+    lons1 = np.array([[d.get(p, np.nan) for p in MATCH_ORDER] for d in dicts1], dtype=np.float64)
+    lons2 = np.array([[d.get(p, np.nan) for p in MATCH_ORDER] for d in dicts2], dtype=np.float64)
+    missing = np.isnan(lons1) | np.isnan(lons2)
+    # Charts without a Lagna count houses from Aries, as find_house_from_lagna(lon, 0) did
+    sign1 = (np.nan_to_num(lons1) * INV_30).astype(np.int64) % 12
+    sign2 = (np.nan_to_num(lons2) * INV_30).astype(np.int64) % 12
+    bhava1 = (sign1 - sign1[:, :1]) % 12 + 1
+    bhava2 = (sign2 - sign2[:, :1]) % 12 + 1
+    relation = PAIR_FRIENDSHIP[SIGN_LORD_IDX[sign1], SIGN_LORD_IDX[sign2]]
+    friendly = (relation >= 3) & ~missing
+
+    results = []
+    for k, (s1, s2, b1, b2, rel, miss) in enumerate(zip(
+        sign1.tolist(), sign2.tolist(), bhava1.tolist(), bhava2.tolist(), relation.tolist(), missing.tolist()
+    )):
+        rows = []
+        for i, p in enumerate(MATCH_ORDER):
+            if p == "Lagna" and "Lagna" not in dicts1[k]: continue
+            if miss[i]:
+                rows.append([p, "-", "-", "-"])
+                continue
+            rows.append([
+                p,
+                f"{SIGN_NAMES[s1[i]]} ({SIGN_LORD_MAP[s1[i]]}) [{b1[i]}H]",
+                f"{SIGN_NAMES[s2[i]]} ({SIGN_LORD_MAP[s2[i]]}) [{b2[i]}H]",
+                FRIENDSHIP_NAMES[rel[i]],
+            ])
+        results.append((rows, int(friendly[k].sum()), len(rows)))
+    return results
 
 def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_name=None, contact_mobile=None):
     logging.debug("generate_compatibility_report() started")
@@ -718,31 +918,29 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
     guna_score = calculate_ashtakoota(chart1["analysis_data"], chart2["analysis_data"])
 
     # Dasha & CSL Logic
-    c1_11_link = 11 in chart1["csl_significators"]
-    c2_11_link = 11 in chart2["csl_significators"]
-    c1_family_link = any(h in chart1["csl_significators"] for h in [2, 5])
-    c2_family_link = any(h in chart2["csl_significators"] for h in [2, 5])
-    c1_affliction = any(h in chart1["csl_significators"] for h in [8, 12])
-    c2_affliction = any(h in chart2["csl_significators"] for h in [8, 12])
+    c1_flags = get_chart_flags(chart1)
+    c2_flags = get_chart_flags(chart2)
+    c1_labels = get_flag_labels(c1_flags)
+    c2_labels = get_flag_labels(c2_flags)
 
     c1_md_lord = chart1["md_lord"]
     c1_ad_lord = chart1["ad_lord"]
     c1_pd_lord = chart1["pd_lord"]
-    c1_md_sigs = chart1["planet_significators"].get(c1_md_lord, [])
-    c1_ad_sigs = chart1["planet_significators"].get(c1_ad_lord, [])
-    c1_pd_sigs = chart1["planet_significators"].get(c1_pd_lord, [])
+    c1_md_mask = chart1["planet_significator_masks"].get(c1_md_lord, 0)
+    c1_ad_mask = chart1["planet_significator_masks"].get(c1_ad_lord, 0)
+    c1_pd_mask = chart1["planet_significator_masks"].get(c1_pd_lord, 0)
     c2_md_lord = chart2["md_lord"]
     c2_ad_lord = chart2["ad_lord"]
     c2_pd_lord = chart2["pd_lord"]
-    c2_md_sigs = chart2["planet_significators"].get(c2_md_lord, [])
-    c2_ad_sigs = chart2["planet_significators"].get(c2_ad_lord, [])
-    c2_pd_sigs = chart2["planet_significators"].get(c2_pd_lord, [])
-    c1_md_status = check_dasha_marriage_potential(c1_md_sigs)
-    c1_ad_status = check_dasha_marriage_potential(c1_ad_sigs)
-    c1_pd_status = check_dasha_marriage_potential(c1_pd_sigs)
-    c2_md_status = check_dasha_marriage_potential(c2_md_sigs)
-    c2_ad_status = check_dasha_marriage_potential(c2_ad_sigs)
-    c2_pd_status = check_dasha_marriage_potential(c2_pd_sigs)
+    c2_md_mask = chart2["planet_significator_masks"].get(c2_md_lord, 0)
+    c2_ad_mask = chart2["planet_significator_masks"].get(c2_ad_lord, 0)
+    c2_pd_mask = chart2["planet_significator_masks"].get(c2_pd_lord, 0)
+    c1_md_status = check_dasha_marriage_potential(c1_md_mask)
+    c1_ad_status = check_dasha_marriage_potential(c1_ad_mask)
+    c1_pd_status = check_dasha_marriage_potential(c1_pd_mask)
+    c2_md_status = check_dasha_marriage_potential(c2_md_mask)
+    c2_ad_status = check_dasha_marriage_potential(c2_ad_mask)
+    c2_pd_status = check_dasha_marriage_potential(c2_pd_mask)
     c1_marriage_support = (c1_ad_status == "STRONG_PROMISE" or c1_pd_status == "STRONG_PROMISE")
     c2_marriage_support = (c2_ad_status == "STRONG_PROMISE" or c2_pd_status == "STRONG_PROMISE")
     c1_denial_active = (c1_ad_status == "DENIAL_PERIOD" or c1_pd_status == "DENIAL_PERIOD")
@@ -762,21 +960,14 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
         dasha_verdict = "WEAK/NEUTRAL: Current Dasha relies heavily on natal promise."
     supplementary_results['Dasha_Synchronization'] = dasha_verdict
 
-    styles = getSampleStyleSheet()
+    styles = REPORT_STYLES
     story = []
-    table_style_data = TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-    ])
 
     story.append(Paragraph("KP and Vedic Match-Making Compatibility Report (D1-D9-D50)", styles["h1"]))
     story.append(Spacer(1, 12))
-    story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles["Italic"]))
+    generated_at = datetime.now()
+    # Date only: finished PDFs are cached per day, so a time of day would go stale on reuse
+    story.append(Paragraph(f"Generated on: {generated_at.strftime('%Y-%m-%d')}", styles["Italic"]))
     if contact_name or contact_mobile:
         ctext = f"Consultant: {contact_name or ''}   Mobile: {contact_mobile or ''}"
         story.append(Paragraph(ctext, styles["Normal"]))
@@ -792,23 +983,15 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
     ]
     story.append(Paragraph("1. Basic Natal Details", styles["h2"]))
     details_table = Table(details_data, colWidths=[130, 190, 190])
-    details_table.setStyle(table_style_data)
+    details_table.setStyle(TABLE_STYLE_DATA)
     story.append(details_table)
     story.append(Spacer(1, 18))
 
     # --- 2. SOUTH INDIAN CHARTS (D1) ---
     story.append(Paragraph("2. Natal Charts (South Indian Style)", styles["h2"]))
     
-    def get_south_chart_data(planet_data, title):
-        abbr = {"Sun": "Su", "Moon": "Mo", "Mars": "Ma", "Mercury": "Me", 
-                "Jupiter": "Ju", "Venus": "Ve", "Saturn": "Sa", "Rahu": "Ra", 
-                "Ketu": "Ke", "Lagna": "Asc"}
-        signs = {i: [] for i in range(12)}
-        for p, lon in planet_data.items():
-            if p not in abbr: continue
-            sign_idx = int(lon / 30) % 12
-            signs[sign_idx].append(abbr[p])
-        def c(idx): return "\n".join(signs[idx])
+    def get_south_chart_data(signs, title):
+        def c(idx): return signs[idx]
         data = [
             [c(11), c(0), c(1), c(2)],
             [c(10), title, "", c(3)],
@@ -818,40 +1001,34 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
         return data
     
     # Chart 1 D1
-    c1_d1_data = get_south_chart_data(chart1["analysis_data"]["planets"], f"{chart1['name']}\nD1 (Rasi)")
-    c2_d1_data = get_south_chart_data(chart2["analysis_data"]["planets"], f"{chart2['name']}\nD1 (Rasi)")
+    c1_display = precompute_chart_display(chart1)
+    c2_display = precompute_chart_display(chart2)
+    c1_d1_data = get_south_chart_data(c1_display["d1"], f"{chart1['name']}\nD1 (Rasi)")
+    c2_d1_data = get_south_chart_data(c2_display["d1"], f"{chart2['name']}\nD1 (Rasi)")
     
-    chart_style = TableStyle([
-        ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('FONTSIZE', (0,0), (-1,-1), 8),
-        ('SPAN', (1,1), (2,2)) # Merge center for title
-    ])
     
     t1 = Table(c1_d1_data, colWidths=[40,40,40,40], rowHeights=[40,40,40,40])
-    t1.setStyle(chart_style)
+    t1.setStyle(CHART_STYLE)
     t2 = Table(c2_d1_data, colWidths=[40,40,40,40], rowHeights=[40,40,40,40])
-    t2.setStyle(chart_style)
+    t2.setStyle(CHART_STYLE)
     
     # Container Table to hold them side-by-side
-    container = Table([[t1, Spacer(20, 20), t2]])
+    container = Table([[t1, Spacer(20, 20), t2]], colWidths=CHART_PAIR_COL_WIDTHS)
     story.append(container)
     story.append(Spacer(1, 24))
 
 
     story.append(Paragraph("3. Planetary Positional Analysis (Rasi-Star-Sub)", styles["h2"]))
-    position_header = ["Graha", "Rasi Lord", "Star Lord", "Sub Lord", "Longitude", "Nakshatra", "Pada"]
-    c1_position_data = [position_header] + chart1["kp_positions"]
+    c1_position_data = [POSITION_HEADER] + chart1["kp_positions"]
     story.append(Paragraph(f"Native 1 ({chart1['name']}) Positions:", styles["h3"]))
     c1_pos_table = Table(c1_position_data, colWidths=[60, 80, 80, 80, 120, 100, 60])
-    c1_pos_table.setStyle(table_style_data)
+    c1_pos_table.setStyle(TABLE_STYLE_DATA)
     story.append(c1_pos_table)
     story.append(Spacer(1, 12))
-    c2_position_data = [position_header] + chart2["kp_positions"]
+    c2_position_data = [POSITION_HEADER] + chart2["kp_positions"]
     story.append(Paragraph(f"Native 2 ({chart2['name']}) Positions:", styles["h3"]))
     c2_pos_table = Table(c2_position_data, colWidths=[60, 80, 80, 80, 120, 100, 60])
-    c2_pos_table.setStyle(table_style_data)
+    c2_pos_table.setStyle(TABLE_STYLE_DATA)
     story.append(c2_pos_table)
     story.append(Spacer(1, 24))
 
@@ -862,7 +1039,7 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
         ["Pitra Dosha", "Present" if chart1["pitra_dosha_present"] else "Clean", "Present" if chart2["pitra_dosha_present"] else "Clean", "Indicates issues with destiny/ancestral blessings."],
         ["Rahu/Ketu Affliction", chart1["rahu_dosha_status"]["Total"], chart2["rahu_dosha_status"]["Total"], "Indicates unpredictable challenges."],
     ]
-    story.append(Table(dosha_data, colWidths=[160, 130, 130, 90], style=table_style_data))
+    story.append(Table(dosha_data, colWidths=[160, 130, 130, 90], style=TABLE_STYLE_DATA))
     story.append(Spacer(1, 12))
     fav_data = [
         ["Graha", "Jupiter", "Saturn", "Venus", "Sun"],
@@ -870,7 +1047,7 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
         [f"Fav/Unfav (KP Sigs) - {chart2['name']}", chart2["planet_favorability"]["Jupiter"], chart2["planet_favorability"]["Saturn"], chart2["planet_favorability"]["Venus"], chart2["planet_favorability"]["Sun"]],
     ]
     story.append(Paragraph("Planetary Strength & Favorability (KP Significators)", styles["h3"]))
-    story.append(Table(fav_data, colWidths=[130, 90, 90, 90, 90], style=table_style_data))
+    story.append(Table(fav_data, colWidths=[130, 90, 90, 90, 90], style=TABLE_STYLE_DATA))
     story.append(Spacer(1, 18))
     
     story.append(Paragraph("5. Vedic Guna Milan & Dasha Synchronization", styles["h2"]))
@@ -880,10 +1057,10 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
         ["CSL Sigs", str(chart1["csl_significators"]), str(chart2["csl_significators"]), "KP House Links"],
         ["Vedic Guna Milan (36)", f"{guna_score} / 36", f"{guna_score} / 36", "36 max. 18+ is usually acceptable."],
     ]
-    story.append(Table(promise_data, colWidths=[130, 90, 90, 190], style=table_style_data))
+    story.append(Table(promise_data, colWidths=[130, 90, 90, 190], style=TABLE_STYLE_DATA))
     story.append(Spacer(1, 12))
     
-    story.append(Paragraph(f"Current Vimsottari Dasha Period ({datetime.now().strftime('%Y-%m-%d')}) Match:", styles["h3"]))
+    story.append(Paragraph(f"Current Vimsottari Dasha Period ({generated_at.strftime('%Y-%m-%d')}) Match:", styles["h3"]))
     dasha_table_data = [
         ["Dasha Lord", f"Native 1 ({chart1['name']})", f"Native 2 ({chart2['name']})", "Status (N1)", "Status (N2)"],
         ["Maha Dasha (MD)", chart1["md_lord"], chart2["md_lord"], c1_md_status, c2_md_status],
@@ -891,7 +1068,7 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
         ["Pratyantardasha (PD)", chart1["pd_lord"], chart2["pd_lord"], c1_pd_status, c2_pd_status],
     ]
     dasha_table = Table(dasha_table_data, colWidths=[110, 85, 85, 110, 110])
-    dasha_table.setStyle(table_style_data)
+    dasha_table.setStyle(TABLE_STYLE_DATA)
     story.append(dasha_table) 
     story.append(Spacer(1, 6))
     story.append(Paragraph(f"Dasha Synchronization Verdict: {dasha_verdict}", styles["Normal"]))
@@ -902,107 +1079,67 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
     twenty_one_data = [
         ["Factor", chart1['name'] + " Status", chart2['name'] + " Status", "Compatibility Verdict"],
         ["Kuja Dosha Parity", chart1["mars_dosha_status"]["Total"], chart2["mars_dosha_status"]["Total"], supplementary_results['Kuja_Dosha_Parity']],
-        ["Ayurvriddhi (Longevity)", "Good" if not any(h in chart1["csl_significators"] for h in [8, 12]) else "Risk", "Good" if not any(h in chart2["csl_significators"] for h in [8, 12]) else "Risk", supplementary_results['Ayurvriddhi_Match']],
+        ["Ayurvriddhi (Longevity)", c1_labels["ayurvriddhi"], c2_labels["ayurvriddhi"], supplementary_results['Ayurvriddhi_Match']],
         ["Vaidhavya Dosha", supplementary_results['Vaidhavya_Risk'], supplementary_results['Vaidhavya_Risk'], supplementary_results['Vaidhavya_Risk']],
         ["Pitra Dosha Match", "Present" if chart1["pitra_dosha_present"] else "Clean", "Present" if chart2["pitra_dosha_present"] else "Clean", supplementary_results['Pitra_Dosha_Match']],
-        ["Santana (Progeny)", "Promising" if any(h in chart1["csl_significators"] for h in [2, 5, 11]) else "Weak", "Promising" if any(h in chart2["csl_significators"] for h in [2, 5, 11]) else "Weak", supplementary_results['Progeny_Match']],
-        ["Financial Match", "Strong" if any(h in chart1["csl_significators"] for h in [2, 11]) else "Average", "Strong" if any(h in chart2["csl_significators"] for h in [2, 11]) else "Average", supplementary_results['Financial_Match']],
+        ["Santana (Progeny)", c1_labels["progeny"], c2_labels["progeny"], supplementary_results['Progeny_Match']],
+        ["Financial Match", c1_labels["financial"], c2_labels["financial"], supplementary_results['Financial_Match']],
         ["Karaka Graha", supplementary_results['Karaka_Compatibility'], supplementary_results['Karaka_Compatibility'], supplementary_results['Karaka_Compatibility']],
         ["7th Lord Strength", supplementary_results['7th_Lord_Strength'], supplementary_results['7th_Lord_Strength'], supplementary_results['7th_Lord_Strength']],
-        ["Ashtama Shani", "8th Link" if 8 in chart1["saturn_significators"] else "Clean", "8th Link" if 8 in chart2["saturn_significators"] else "Clean", supplementary_results['Ashtama_Shani_Effect']],
+        ["Ashtama Shani", c1_labels["ashtama_shani"], c2_labels["ashtama_shani"], supplementary_results['Ashtama_Shani_Effect']],
         ["Rasi Lord Match", chart1["rasi_lord"], chart2["rasi_lord"], supplementary_results['Rasi_Navamsa_Match']],
-        ["Ascendant Lord Friendship", SIGN_LORD_MAP.get(int(chart1["kp_positions"][0][4].split()[0].split('°')[0]) // 30), SIGN_LORD_MAP.get(int(chart2["kp_positions"][0][4].split()[0].split('°')[0]) // 30), supplementary_results['Lagna_Lord_Friendship']],
+        ["Ascendant Lord Friendship", chart1["asc_lord"], chart2["asc_lord"], supplementary_results['Lagna_Lord_Friendship']],
         ["D9 Lagna Lord Friendship", chart1["analysis_data"]["d9_lagna_lord"], chart2["analysis_data"]["d9_lagna_lord"], supplementary_results['D9_Lagna_Lord_Friendship']],
     ]
-    story.append(Table(twenty_one_data, colWidths=[150, 100, 100, 160], style=table_style_data))
+    story.append(Table(twenty_one_data, colWidths=[150, 100, 100, 160], style=TABLE_STYLE_DATA))
     
     # ------------------------------------------------------------------
     # NEW SECTIONS: FULL PLANETARY MATCHING WITH BHAVA (HOUSE)
     # ------------------------------------------------------------------
     
-    def get_chart_match_row(planet_key, chart_dict1, chart_dict2):
-        if planet_key == "Lagna":
-            if "Lagna" in chart_dict1:
-                s1_lon = chart_dict1["Lagna"]
-                s2_lon = chart_dict2["Lagna"]
-            else:
-                return None
-        else:
-            s1_lon = chart_dict1.get(planet_key)
-            s2_lon = chart_dict2.get(planet_key)
-            
-        if s1_lon is None or s2_lon is None: return [planet_key, "-", "-", "-"]
-        
-        sign1 = get_sign_name(s1_lon)
-        sign2 = get_sign_name(s2_lon)
-        lord1 = SIGN_LORD_MAP[int(s1_lon / 30)]
-        lord2 = SIGN_LORD_MAP[int(s2_lon / 30)]
-        
-        # Get Bhava
-        lagna1 = chart_dict1.get("Lagna", 0)
-        bhava1 = find_house_from_lagna(s1_lon, lagna1)
-        lagna2 = chart_dict2.get("Lagna", 0)
-        bhava2 = find_house_from_lagna(s2_lon, lagna2)
-        
-        friendship = check_parashari_friendship(lord1, lord2)
-        
-        display1 = f"{sign1} ({lord1}) [{bhava1}H]"
-        display2 = f"{sign2} ({lord2}) [{bhava2}H]"
-        
-        return [planet_key, display1, display2, friendship]
-
-    def build_match_table(title, dict1, dict2):
+    def build_match_table(title, label, dict1, dict2, match):
         story.append(PageBreak())
+        if not dict1 or not dict2:
+            story.append(Paragraph(f"{title} — data unavailable", styles["h2"]))
+            return 0
+        rows, friendly_count, total_checked = match
         story.append(Paragraph(title, styles["h2"]))
         story.append(Spacer(1, 6))
         
         # Visual Charts for this section
-        c1_data = get_south_chart_data(dict1, f"{chart1['name']}\n{title.split()[2]}")
-        c2_data = get_south_chart_data(dict2, f"{chart2['name']}\n{title.split()[2]}")
+        c1_data = get_south_chart_data(c1_display[label.lower()], f"{chart1['name']}\n{label}")
+        c2_data = get_south_chart_data(c2_display[label.lower()], f"{chart2['name']}\n{label}")
         t1 = Table(c1_data, colWidths=[40,40,40,40], rowHeights=[40,40,40,40])
-        t1.setStyle(chart_style)
+        t1.setStyle(CHART_STYLE)
         t2 = Table(c2_data, colWidths=[40,40,40,40], rowHeights=[40,40,40,40])
-        t2.setStyle(chart_style)
-        story.append(Table([[t1, Spacer(20, 20), t2]]))
+        t2.setStyle(CHART_STYLE)
+        story.append(Table([[t1, Spacer(20, 20), t2]], colWidths=CHART_PAIR_COL_WIDTHS))
         story.append(Spacer(1, 12))
 
         header = ["Planet", f"{chart1['name']} Sign [Bhava]", f"{chart2['name']} Sign [Bhava]", "Lords Friendship"]
-        rows = [header]
-        friendly_count = 0
-        total_checked = 0
-        
-        planets_to_check = ["Lagna", "Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
-        
-        if title.startswith("7."): 
-            d1_dict1 = dict1.copy(); d1_dict1["Lagna"] = chart1["analysis_data"]["cusps"][0]
-            d1_dict2 = dict2.copy(); d1_dict2["Lagna"] = chart2["analysis_data"]["cusps"][0]
-            final_d1 = d1_dict1
-            final_d2 = d1_dict2
-        else:
-            final_d1 = dict1
-            final_d2 = dict2
-
-        for p in planets_to_check:
-            row = get_chart_match_row(p, final_d1, final_d2)
-            if row:
-                rows.append(row)
-                if "Friend" in row[3]: friendly_count += 1
-                total_checked += 1
-        
-        t = Table(rows, colWidths=[60, 160, 160, 120], style=table_style_data)
+        t = Table([header] + rows, colWidths=[60, 160, 160, 120], style=TABLE_STYLE_DATA)
         story.append(t)
         story.append(Spacer(1, 12))
         story.append(Paragraph(f"Compatibility Score: {friendly_count} / {total_checked} Friendly Pairs", styles["h3"]))
         return friendly_count
 
+    c1_analysis = chart1["analysis_data"]
+    c2_analysis = chart2["analysis_data"]
+    # D1 match reads the Lagna straight from the 1st cusp (overlay, no copy)
+    c1_d1 = ChainMap({"Lagna": c1_analysis["cusps"][0]}, c1_analysis["planets"])
+    c2_d1 = ChainMap({"Lagna": c2_analysis["cusps"][0]}, c2_analysis["planets"])
+    c1_divs = (c1_d1, c1_analysis.get("d9_planets") or {}, c1_analysis.get("d50_planets") or {})
+    c2_divs = (c2_d1, c2_analysis.get("d9_planets") or {}, c2_analysis.get("d50_planets") or {})
+    d1_match, d9_match, d50_match = get_match_rows(c1_divs, c2_divs)
+
     # 7. D1 Match
-    d1_score = build_match_table("7. Full D1 (Rasi) Match", chart1["analysis_data"]["planets"], chart2["analysis_data"]["planets"])
+    d1_score = build_match_table("7. Full D1 (Rasi) Match", "D1", c1_divs[0], c2_divs[0], d1_match)
     
     # 8. D9 Match
-    d9_score = build_match_table("8. Full D9 (Navamsa) Match", chart1["analysis_data"]["d9_planets"], chart2["analysis_data"]["d9_planets"])
+    d9_score = build_match_table("8. Full D9 (Navamsa) Match", "D9", c1_divs[1], c2_divs[1], d9_match)
     
     # 9. D50 Match
-    d50_score = build_match_table("9. Full D50 (50th Harmonic) Match", chart1["analysis_data"]["d50_planets"], chart2["analysis_data"]["d50_planets"])
+    d50_score = build_match_table("9. Full D50 (50th Harmonic) Match", "D50", c1_divs[2], c2_divs[2], d50_match)
     
     story.append(Spacer(1, 24))
     
@@ -1023,25 +1160,24 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
     elif dasha_verdict.startswith("STRONGLY SUPPORTIVE"): kp_dasha_status = "Strong"
     elif dasha_verdict in ["MIXED", "WEAK/NEUTRAL"]: kp_dasha_status = "Mixed"
 
-    good_factors = 0
     supp_results = supplementary_results
-    
-    if "Unmatched" not in supp_results['Kuja_Dosha_Parity']: good_factors += 1
-    if supp_results['Ayurvriddhi_Match'] == "Good": good_factors += 1
-    if supp_results['Vaidhavya_Risk'] == "Low": good_factors += 1
-    if supp_results['Pitra_Dosha_Match'] != "Present in Both": good_factors += 1
-    if supp_results['Progeny_Match'] == "Strong": good_factors += 1
-    if supp_results['Financial_Match'] == "Strong": good_factors += 1
-    if supp_results['Karaka_Compatibility'] == "High": good_factors += 1
-    if supp_results['7th_Lord_Strength'] == "Good": good_factors += 1
-    if supp_results['Ashtama_Shani_Effect'] == "Low Risk": good_factors += 1
-    
-    # Add Chart Scores to Factors
-    if d1_score >= 5: good_factors += 1
-    if d9_score >= 5: good_factors += 1
-    if d50_score >= 5: good_factors += 1
-        
-    total_factors_checked = 12 
+    factor_checks = (
+        "Unmatched" not in supp_results['Kuja_Dosha_Parity'],
+        supp_results['Ayurvriddhi_Match'] == "Good",
+        supp_results['Vaidhavya_Risk'] == "Low",
+        supp_results['Pitra_Dosha_Match'] != "Present in Both",
+        supp_results['Progeny_Match'] == "Strong",
+        supp_results['Financial_Match'] == "Strong",
+        supp_results['Karaka_Compatibility'] == "High",
+        supp_results['7th_Lord_Strength'] == "Good",
+        supp_results['Ashtama_Shani_Effect'] == "Low Risk",
+        # Chart scores count as factors too
+        d1_score >= 5,
+        d9_score >= 5,
+        d50_score >= 5,
+    )
+    good_factors = sum(factor_checks)
+    total_factors_checked = len(factor_checks)
     fold_summary_status = "Average"
     if good_factors >= 9: fold_summary_status = "Strong"
     elif good_factors < 6: fold_summary_status = "Weak"
@@ -1082,21 +1218,9 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
         ["D50 Match (Sign/Bhava)", f"{d50_score}/10", "Friendly Sign Lords"],
         ["Supplementary", fold_summary_text, f"Combined Score"],
     ]
-    
-    verdict_table_style = TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.darkblue),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-        ("BACKGROUND", (0, 1), (-1, -1), colors.lightblue),
-        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("FONTNAME", (0, 1), (0, -1), "Helvetica-Bold"),
-    ])
 
     verdict_table = Table(verdict_summary_data, colWidths=[140, 100, 260])
-    verdict_table.setStyle(verdict_table_style)
+    verdict_table.setStyle(VERDICT_TABLE_STYLE)
     story.append(verdict_table)
     story.append(Spacer(1, 24))
 
@@ -1105,8 +1229,7 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
     
     if verdict_notes:
         story.append(Paragraph("Reasoning / Notes:", styles["h3"]))
-        for note in verdict_notes:
-            story.append(Paragraph(f"• {note}", styles["Normal"]))
+        story.append(Paragraph("<br/>".join(f"• {note}" for note in verdict_notes), styles["Normal"]))
 
     story.append(Spacer(1, 24))
     story.append(Paragraph("Disclaimer", styles["h2"]))
@@ -1118,7 +1241,8 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
 
     buffer = io.BytesIO()
     try:
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        # Built-in Helvetica needs no font registration; invariant output skips per-build timestamps/IDs
+        doc = SimpleDocTemplate(buffer, pagesize=letter, pageCompression=1, invariant=1)
         doc.build(story)
         buffer.seek(0)
         return buffer
@@ -1129,9 +1253,29 @@ def generate_compatibility_report(chart1, chart2, disclaimer_text=None, contact_
 
 # --- STREAMLIT GUI APPLICATION ---
 
+# Place names and zone boundaries rarely change; keep lookups for a day
+@st.cache_data(show_spinner=False, ttl=86400)
+def geocode_place(place: str):
+    return geolocator.geocode(place, timeout=10)
+
+@st.cache_data(show_spinner=False, ttl=86400)
+def tz_for(lat, lon):
+    return TZF.timezone_at(lat=lat, lng=lon) if TZF else None
+
+def get_report_key(chart1, chart2, *extra):
+    """Stable digest of both charts plus report options, used as the PDF cache key."""
+    payload = json.dumps([chart1, chart2, *extra], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+# Charts are passed as _-prefixed args so Streamlit keys only on report_key instead of re-hashing them
+@st.cache_data(show_spinner=False, max_entries=32)
+def build_report_pdf(report_key, _chart1, _chart2, disclaimer_text, contact_name, contact_mobile):
+    buffer = generate_compatibility_report(_chart1, _chart2, disclaimer_text, contact_name, contact_mobile)
+    return buffer.getvalue() if buffer else None
+
 def fetch_lat_lon(place):
     try:
-        location = geolocator.geocode(place, timeout=10)
+        location = geocode_place(place)
         if location:
             return location.latitude, location.longitude
         return None, None
@@ -1142,7 +1286,8 @@ def fetch_lat_lon(place):
 def get_timezone_from_coords(lat, lon):
     try:
         if TZF:
-            return TZF.timezone_at(lng=lon, lat=lat)
+            # ~100 m grid: nearby points share a cache entry (and a zone)
+            return tz_for(round(lat, 3), round(lon, 3))
     except Exception as e:
         logging.warning(f"Timezone lookup failed: {e}")
     return None
@@ -1172,8 +1317,6 @@ def main():
     if not os.path.exists(EPHE_PATH):
         st.error(f"Ephemeris path not found: {EPHE_PATH}. Please create an 'ephe' folder and add Swiss Ephemeris files.")
         return
-    else:
-        se.set_ephe_path(EPHE_PATH)
 
     col1, col2 = st.columns(2)
 
@@ -1234,43 +1377,51 @@ def main():
         n2_tz = st.selectbox("Timezone", build_tz_options(st.session_state.get('n2_tz')), key="n2_tz")
 
     if st.button("Analyze Match & Generate Report", type="primary"):
+        if n1_tz == "Select Timezone..." or n2_tz == "Select Timezone...":
+            st.error("Please select a timezone for both profiles.")
+            return
+        if not n1_dob or not n2_dob:
+            st.error("Please select Date of Birth for both profiles.")
+            return
+        if not n1_tob or not n2_tob:
+            st.error("Please select Time of Birth for both profiles.")
+            return
         try:
             with st.spinner("Analyzing charts..."):
-                if n1_tz == "Select Timezone..." or n2_tz == "Select Timezone...":
-                    st.error("Please select a timezone for both profiles.")
-                    return
-                if not n1_dob or not n2_dob:
-                    st.error("Please select Date of Birth for both profiles.")
-                    return
-                if not n1_tob or not n2_tob:
-                    st.error("Please select Time of Birth for both profiles.")
+                try:
+                    chart1 = analyze_chart(n1_dob, n1_tob, n1_lat, n1_lon, n1_tz, n1_name)
+                    chart2 = analyze_chart(n2_dob, n2_tob, n2_lat, n2_lon, n2_tz, n2_name)
+                except (ValueError, KeyError, se.Error) as e:
+                    # Bad birth data or an unusable ephemeris/timezone input (e.g. Placidus at polar latitudes)
+                    st.error(f"Could not analyze the charts: {e}")
+                    logging.warning(f"Analysis input error: {e}")
                     return
-                chart1 = analyze_chart(n1_dob, n1_tob, n1_lat, n1_lon, n1_tz, n1_name)
-                chart2 = analyze_chart(n2_dob, n2_tob, n2_lat, n2_lon, n2_tz, n2_name)
-
-                if chart1 and chart2:
-                    pdf_buffer = generate_compatibility_report(chart1, chart2, disclaimer, contact_name, contact_mobile)
-                    
-                    if pdf_buffer:
-                        st.success("Report Generated Successfully!")
-                        
-                        # Display some key results immediately
-                        st.markdown("### Match Summary")
-                        
-                        # Extract some data for display (re-calculating or extracting from report logic would be cleaner, 
-                        # but for now let's just show the PDF download)
-                        
-                        st.download_button(
-                            label="Download PDF Report",
-                            data=pdf_buffer,
-                            file_name=f"KPMatch_{n1_name}_{n2_name}.pdf",
-                            mime="application/pdf"
-                        )
-                    else:
-                        st.error("Failed to generate PDF report.")
+                if not (chart1 and chart2): return
+                # Report date is in the key so a cached PDF never carries a previous day's stamp
+                report_key = get_report_key(chart1, chart2, date.today().isoformat())
+                pdf_bytes = build_report_pdf(report_key, chart1, chart2, disclaimer, contact_name, contact_mobile)
         except Exception as e:
             st.error(f"An error occurred: {e}")
             logging.error(f"Analysis Error: {e}", exc_info=True)
+            return
+
+        if pdf_bytes:
+            st.success("Report Generated Successfully!")
+            
+            # Display some key results immediately
+            st.markdown("### Match Summary")
+            
+            # Extract some data for display (re-calculating or extracting from report logic would be cleaner, 
+            # but for now let's just show the PDF download)
+            
+            st.download_button(
+                label="Download PDF Report",
+                data=pdf_bytes,
+                file_name=f"KPMatch_{n1_name}_{n2_name}.pdf",
+                mime="application/pdf"
+            )
+        else:
+            st.error("Failed to generate PDF report.")
 
 if __name__ == "__main__":
     main()